@@ -5,22 +5,49 @@ Vehicle Telematics Data Generator
 Generates realistic vehicle telematics data for 500 vehicles traveling
 from San Francisco to Los Angeles along Highway 5 over a 1-hour period.
 
-Output: Individual JSON files, one telematics entry per file.
+Output: A single newline-delimited JSON file (one telematics entry per
+line). Pass --per-file to emit individual JSON files instead, one entry
+per file.
 """
 
+import argparse
+import bisect
+import hashlib
 import json
+import mmap
+import multiprocessing as mp
+import queue
 import random
 import string
+import threading
 import os
 from datetime import datetime, timedelta
 from pathlib import Path
 
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the kernel runs as plain Python without it
+    def njit(*args, **kwargs):
+        def wrap(func):
+            return func
+        return wrap
+
 # Configuration
 NUM_VEHICLES = 500
 DURATION_HOURS = 1
 INTERVAL_MINUTES = 5
 OUTPUT_DIR = Path("json")
+NDJSON_FILE = "telematics.ndjson"
 VIN_FILE = "vins.txt"
+CACHE_DIR = Path(".cache")
+MMAP_LINE_WIDTH = 512  # fixed-width line slot per reading in --mmap mode
 
 # Route waypoints along I-5 from San Francisco to Los Angeles
 # Format: (latitude, longitude, mile_marker)
@@ -39,184 +66,499 @@ ROUTE_WAYPOINTS = [
     (34.0522, -118.2437, 380),    # Los Angeles
 ]
 
+# Column views of the waypoints for vectorized interpolation
+WP_LAT = np.array([wp[0] for wp in ROUTE_WAYPOINTS])
+WP_LON = np.array([wp[1] for wp in ROUTE_WAYPOINTS])
+WP_MILE = np.array([wp[2] for wp in ROUTE_WAYPOINTS], dtype=np.float64)
+
+# Plain-tuple columns for the scalar bisect lookup
+_LATS = tuple(wp[0] for wp in ROUTE_WAYPOINTS)
+_LONS = tuple(wp[1] for wp in ROUTE_WAYPOINTS)
+_MILES = tuple(wp[2] for wp in ROUTE_WAYPOINTS)
+
+# Speed-regime multiplier bounds, indexed branchlessly in the kernel:
+# 0 = open highway, 1 = leaving SF (city traffic),
+# 2 = Grapevine grade, 3 = approaching LA (traffic)
+SPEED_REGIME_LO = np.array([0.85, 0.4, 0.7, 0.3])
+SPEED_REGIME_HI = np.array([1.15, 0.7, 0.85, 0.6])
+
+# Tire positions, in the order noise columns are drawn
+TIRE_KEYS = ("front_left", "front_right", "rear_left", "rear_right")
+
+# Columnar (structure-of-arrays) layout for one vehicle's readings.
+# Batches travel between processes and to the writers in this form;
+# JSON dicts are only materialized at serialization time.
+READING_DTYPE = np.dtype([
+    ("engine_temp_f", "f4"),
+    ("fuel_level_pct", "f4"),
+    ("lat", "f8"),     # 6-decimal coordinates need double precision
+    ("lon", "f8"),
+    ("speed_mph", "f4"),
+    ("front_left", "f4"),
+    ("front_right", "f4"),
+    ("rear_left", "f4"),
+    ("rear_right", "f4"),
+])
+
 # VIN generation helpers (simplified but realistic format)
 VIN_CHARS = "ABCDEFGHJKLMNPRSTUVWXYZ0123456789"  # No I, O, Q
 VIN_DIGITS = "0123456789"
-
-
-def generate_vin():
-    """Generate a realistic-looking VIN (17 characters)."""
-    # World Manufacturer Identifier (first 3 chars)
-    wmi_options = ["1FA", "1FT", "1FM", "1FD", "2FA", "3FA", "1G1", "1GC", "1GT", 
+VIN_YEARS = "LMNPRSTVWXY123456789"  # 2020-2029
+# World Manufacturer Identifiers (first 3 chars)
+VIN_WMI_OPTIONS = ["1FA", "1FT", "1FM", "1FD", "2FA", "3FA", "1G1", "1GC", "1GT",
                    "2G1", "3G1", "JN1", "JM1", "WBA", "WDB", "WAU", "5YJ"]
-    wmi = random.choice(wmi_options)
-    
-    # Vehicle Descriptor Section (chars 4-9)
-    vds = ''.join(random.choices(VIN_CHARS, k=5))
-    check_digit = random.choice(VIN_DIGITS + "X")
-    
-    # Vehicle Identifier Section (chars 10-17)
-    model_year = random.choice("LMNPRSTVWXY123456789")  # 2020-2029
-    plant_code = random.choice(VIN_CHARS)
-    sequential = ''.join(random.choices(VIN_DIGITS, k=6))
-    
-    return f"{wmi}{vds}{check_digit}{model_year}{plant_code}{sequential}"
 
 
 def generate_unique_vins(count):
-    """Generate a set of unique VINs."""
+    """Generate a sorted list of unique realistic-looking VINs (17 characters).
+
+    All character columns are drawn in bulk as indices into byte lookup
+    tables, rather than one VIN at a time with per-character choices.
+    """
+    rng = np.random.default_rng()
+    wmis = np.array(VIN_WMI_OPTIONS, dtype="S3")
+    chars = np.frombuffer(VIN_CHARS.encode(), dtype="S1")
+    check_digits = np.frombuffer((VIN_DIGITS + "X").encode(), dtype="S1")
+    years = np.frombuffer(VIN_YEARS.encode(), dtype="S1")
+    digits = np.frombuffer(VIN_DIGITS.encode(), dtype="S1")
+
     vins = set()
     while len(vins) < count:
-        vins.add(generate_vin())
-    return sorted(list(vins))
+        n = count - len(vins)
+        cols = np.empty((n, 17), dtype="S1")
+        # World Manufacturer Identifier (chars 1-3)
+        cols[:, 0:3] = wmis[rng.integers(len(wmis), size=n)].view("S1").reshape(n, 3)
+        # Vehicle Descriptor Section (chars 4-9)
+        cols[:, 3:8] = chars[rng.integers(len(chars), size=(n, 5))]
+        cols[:, 8] = check_digits[rng.integers(len(check_digits), size=n)]
+        # Vehicle Identifier Section (chars 10-17)
+        cols[:, 9] = years[rng.integers(len(years), size=n)]
+        cols[:, 10] = chars[rng.integers(len(chars), size=n)]
+        cols[:, 11:17] = digits[rng.integers(len(digits), size=(n, 6))]
+
+        vins.update(v.decode() for v in cols.view("S17").ravel())
+
+    return sorted(vins)
+
+
+def interpolate_positions(progress, rng):
+    """
+    Interpolate positions along the route for a whole trajectory at once.
+
+    Takes the per-reading progress array (values 0.0 to 1.0) and returns
+    rounded (lat, lon) arrays. The Gaussian lane-change/GPS noise is drawn
+    in one batch instead of two calls per reading.
+    """
+    miles = progress * WP_MILE[-1]
+    idx = np.clip(np.searchsorted(WP_MILE, miles, side="right") - 1, 0, len(WP_MILE) - 2)
+    seg = (miles - WP_MILE[idx]) / (WP_MILE[idx + 1] - WP_MILE[idx])
+
+    lat = WP_LAT[idx] + (WP_LAT[idx + 1] - WP_LAT[idx]) * seg
+    lon = WP_LON[idx] + (WP_LON[idx + 1] - WP_LON[idx]) * seg
+
+    # Add small random variation (lane changes, curves, GPS noise)
+    lat += rng.normal(0, 0.002, size=progress.size)
+    lon += rng.normal(0, 0.002, size=progress.size)
+
+    return np.round(lat, 6), np.round(lon, 6)
 
 
-def interpolate_position(progress, waypoints):
+def interpolate_position(progress):
     """
     Interpolate position along the route based on progress (0.0 to 1.0).
     Adds some realistic lateral variation to simulate lane changes and curves.
+
+    Scalar reference implementation; journeys use the vectorized
+    interpolate_positions() instead. The waypoints are sorted by mile
+    marker, so the bracketing segment comes from a bisect rather than a
+    linear scan.
     """
-    total_distance = waypoints[-1][2]
-    current_mile = progress * total_distance
-    
+    current_mile = progress * _MILES[-1]
+
     # Find the two waypoints we're between
-    prev_wp = waypoints[0]
-    next_wp = waypoints[1]
-    
-    for i, wp in enumerate(waypoints[:-1]):
-        if wp[2] <= current_mile <= waypoints[i + 1][2]:
-            prev_wp = wp
-            next_wp = waypoints[i + 1]
-            break
-    
+    i = min(bisect.bisect_right(_MILES, current_mile) - 1, len(_MILES) - 2)
+    i = max(i, 0)
+
     # Interpolate between waypoints
-    if next_wp[2] == prev_wp[2]:
-        segment_progress = 0
-    else:
-        segment_progress = (current_mile - prev_wp[2]) / (next_wp[2] - prev_wp[2])
-    
-    lat = prev_wp[0] + (next_wp[0] - prev_wp[0]) * segment_progress
-    lon = prev_wp[1] + (next_wp[1] - prev_wp[1]) * segment_progress
-    
+    segment_progress = (current_mile - _MILES[i]) / (_MILES[i + 1] - _MILES[i])
+
+    lat = _LATS[i] + (_LATS[i + 1] - _LATS[i]) * segment_progress
+    lon = _LONS[i] + (_LONS[i + 1] - _LONS[i]) * segment_progress
+
     # Add small random variation (lane changes, curves, GPS noise)
     lat += random.gauss(0, 0.002)
     lon += random.gauss(0, 0.002)
-    
+
     return round(lat, 6), round(lon, 6)
 
 
-def generate_vehicle_journey(vin, start_time, vehicle_seed):
-    """Generate a complete journey for one vehicle."""
-    random.seed(vehicle_seed)
-    
-    readings = []
-    num_readings = (DURATION_HOURS * 60) // INTERVAL_MINUTES
-    
-    # Vehicle characteristics (vary by vehicle)
-    base_speed = random.uniform(55, 75)  # Average highway speed
-    fuel_start = random.uniform(70, 100)  # Starting fuel level
-    fuel_consumption_rate = random.uniform(0.08, 0.15)  # % per reading at cruise
-    
-    # Tire pressures (baseline for this vehicle)
-    tire_baseline = {
-        "front_left": random.uniform(32, 35),
-        "front_right": random.uniform(32, 35),
-        "rear_left": random.uniform(32, 35),
-        "rear_right": random.uniform(32, 35),
-    }
-    
-    # Journey timing
-    # Some vehicles start early, some late, some make stops
-    journey_start_offset = random.randint(0, 30)  # Minutes into the 12h window
-    trip_duration_hours = random.uniform(5.5, 10)  # Time to complete trip
-    
-    # Rest stops (0-3 stops of 15-45 minutes each) - only for longer journeys
-    if num_readings > 60:  # Only add stops for journeys longer than 5 hours
-        num_stops = random.randint(0, 3)
-        stop_times = sorted([random.randint(30, num_readings - 30) for _ in range(num_stops)])
-        stop_durations = [random.randint(3, 9) for _ in range(num_stops)]
-    else:
-        num_stops = 0
-        stop_times = []
-        stop_durations = []
-    
+@njit(cache=True)
+def _simulate(num_readings, base_speed, fuel_start, fuel_rate, progress_per_reading,
+              stop_times, stop_durations, speed_u, temp_u, refuel_u):
+    """
+    Inner simulation loop for one vehicle.
+
+    Consumes pre-drawn uniforms (speed_u/temp_u per reading, refuel_u per
+    stop) and returns the speed, fuel, progress, and engine-temp arrays.
+    Written to compile under numba's njit; falls back to plain Python when
+    numba is not installed.
+    """
+    # float32 is plenty for 2-decimal outputs and halves the memory
+    # bandwidth; progress stays float64 since it feeds the coordinate
+    # interpolation.
+    speed = np.zeros(num_readings, dtype=np.float32)
+    fuel = np.empty(num_readings, dtype=np.float32)
+    progress = np.empty(num_readings)
+    engine_temp = np.empty(num_readings, dtype=np.float32)
+
     current_fuel = fuel_start
-    current_progress = 0  # 0.0 to 1.0
+    current_progress = 0.0  # 0.0 to 1.0
     in_stop = False
     stop_remaining = 0
     stop_idx = 0
-    
+    num_stops = len(stop_times)
+
     for i in range(num_readings):
-        timestamp = start_time + timedelta(minutes=i * INTERVAL_MINUTES)
-        
         # Check if entering a rest stop
         if stop_idx < num_stops and i >= stop_times[stop_idx] and not in_stop:
             in_stop = True
             stop_remaining = stop_durations[stop_idx]
             stop_idx += 1
-        
+
         # During a stop
         if in_stop:
-            speed = 0
             stop_remaining -= 1
             if stop_remaining <= 0:
                 in_stop = False
                 # Refuel during stop
-                current_fuel = min(100, current_fuel + random.uniform(20, 40))
+                current_fuel = min(100.0, current_fuel + 20.0 + 20.0 * refuel_u[stop_idx - 1])
+            # Idling or stopped
+            engine_temp[i] = 175.0 + 20.0 * temp_u[i]
         else:
             # Moving
-            # Speed varies with traffic, terrain, etc.
-            if current_progress < 0.1:  # Leaving SF - slower, city traffic
-                speed = base_speed * random.uniform(0.4, 0.7)
-            elif 0.8 < current_progress < 0.9:  # Grapevine - slower due to grade
-                speed = base_speed * random.uniform(0.7, 0.85)
-            elif current_progress > 0.95:  # Approaching LA - traffic
-                speed = base_speed * random.uniform(0.3, 0.6)
-            else:  # Open highway
-                speed = base_speed * random.uniform(0.85, 1.15)
-            
+            # Speed varies with traffic, terrain, etc. The regime pick
+            # feeds back into progress, so it stays in the loop, but the
+            # if/elif ladder becomes an arithmetic index into the
+            # SPEED_REGIME lookup tables (the bands are disjoint, so at
+            # most one term is nonzero).
+            regime = ((current_progress < 0.1) * 1
+                      + ((current_progress > 0.8) and (current_progress < 0.9)) * 2
+                      + (current_progress > 0.95) * 3)
+            lo = SPEED_REGIME_LO[regime]
+            hi = SPEED_REGIME_HI[regime]
+            speed[i] = base_speed * (lo + (hi - lo) * speed_u[i])
+
             # Progress along route
-            progress_per_reading = (INTERVAL_MINUTES / 60) / trip_duration_hours
-            current_progress = min(1.0, current_progress + progress_per_reading * (speed / base_speed))
-            
+            current_progress = min(1.0, current_progress + progress_per_reading * (speed[i] / base_speed))
+
             # Fuel consumption
-            fuel_consumed = fuel_consumption_rate * (speed / 65)
-            current_fuel = max(5, current_fuel - fuel_consumed)
-        
-        # Get position
-        lat, lon = interpolate_position(current_progress, ROUTE_WAYPOINTS)
-        
-        # Engine temperature (varies with speed and ambient conditions)
-        if speed == 0:
-            engine_temp = random.uniform(175, 195)  # Idling or stopped
-        else:
-            engine_temp = random.uniform(195, 220)  # Normal operating range
-        
-        # Tire pressures (slight variations with temperature/driving)
-        tire_pressure = {
-            k: round(v + random.gauss(0, 0.5) + (speed / 100), 2)
-            for k, v in tire_baseline.items()
-        }
-        
-        reading = {
-            "engine_temp_f": round(engine_temp, 2),
-            "fuel_level_pct": round(current_fuel, 2),
+            current_fuel = max(5.0, current_fuel - fuel_rate * (speed[i] / 65.0))
+
+            # Normal operating range
+            engine_temp[i] = 195.0 + 25.0 * temp_u[i]
+
+        fuel[i] = current_fuel
+        progress[i] = current_progress
+
+    return speed, fuel, progress, engine_temp
+
+
+def generate_vehicle_journey(num_readings, vehicle_seed):
+    """Generate a complete journey for one vehicle.
+
+    Returns a structured array of READING_DTYPE, one row per reading;
+    the VIN and timestamps are attached by the writers.
+    """
+    rng = np.random.default_rng(vehicle_seed)
+
+    # Vehicle characteristics (vary by vehicle)
+    base_speed = rng.uniform(55, 75)  # Average highway speed
+    fuel_start = rng.uniform(70, 100)  # Starting fuel level
+    fuel_consumption_rate = rng.uniform(0.08, 0.15)  # % per reading at cruise
+
+    # Tire pressures (baseline for this vehicle)
+    tire_baseline = rng.uniform(32, 35, size=len(TIRE_KEYS))
+
+    # Journey timing
+    # Some vehicles start early, some late, some make stops
+    journey_start_offset = int(rng.integers(0, 31))  # Minutes into the 12h window
+    trip_duration_hours = rng.uniform(5.5, 10)  # Time to complete trip
+
+    # Rest stops (0-3 stops of 15-45 minutes each) - only for longer journeys
+    if num_readings > 60:  # Only add stops for journeys longer than 5 hours
+        num_stops = int(rng.integers(0, 4))
+        stop_times = sorted(int(t) for t in rng.integers(30, num_readings - 29, size=num_stops))
+        stop_durations = [int(d) for d in rng.integers(3, 10, size=num_stops)]
+    else:
+        num_stops = 0
+        stop_times = []
+        stop_durations = []
+    
+    progress_per_reading = (INTERVAL_MINUTES / 60) / trip_duration_hours
+
+    # Pre-drawn uniforms consumed by the simulation kernel
+    speed_u = rng.random(num_readings)
+    temp_u = rng.random(num_readings)
+    refuel_u = rng.random(max(num_stops, 1))
+
+    speeds, fuels, progress_track, engine_temps = _simulate(
+        num_readings, base_speed, fuel_start, fuel_consumption_rate,
+        progress_per_reading,
+        np.asarray(stop_times, dtype=np.int64),
+        np.asarray(stop_durations, dtype=np.int64),
+        speed_u, temp_u, refuel_u,
+    )
+
+    # Positions for the whole trajectory in one vectorized pass
+    lats, lons = interpolate_positions(progress_track, rng)
+
+    # Tire pressures (slight variations with temperature/driving),
+    # with all the Gaussian noise drawn in a single batch
+    tire_psi = (
+        tire_baseline
+        + rng.standard_normal((num_readings, len(TIRE_KEYS))) * 0.5
+        + (speeds / 100)[:, None]
+    )
+
+    arr = np.empty(num_readings, dtype=READING_DTYPE)
+    arr["engine_temp_f"] = engine_temps
+    arr["fuel_level_pct"] = fuels
+    arr["lat"] = lats
+    arr["lon"] = lons
+    arr["speed_mph"] = speeds
+    for j, key in enumerate(TIRE_KEYS):
+        arr[key] = tire_psi[:, j]
+
+    return arr
+
+
+def _round_column(col, decimals):
+    """Widen a float32 column back to float64 and round for output."""
+    return np.round(col.astype(np.float64), decimals).tolist()
+
+
+def readings_to_dicts(vin, arr, timestamps):
+    """Materialize JSON-ready reading dicts from one columnar batch.
+
+    The 2-decimal rounding happens here, after widening the float32
+    columns to float64, so the JSON text stays exact.
+    """
+    temps = _round_column(arr["engine_temp_f"], 2)
+    fuels = _round_column(arr["fuel_level_pct"], 2)
+    lats = arr["lat"].tolist()
+    lons = arr["lon"].tolist()
+    speeds = _round_column(arr["speed_mph"], 2)
+    tires = [_round_column(arr[key], 2) for key in TIRE_KEYS]
+
+    return [
+        {
+            "engine_temp_f": temps[i],
+            "fuel_level_pct": fuels[i],
             "location": {
-                "latitude": lat,
-                "longitude": lon
+                "latitude": lats[i],
+                "longitude": lons[i]
             },
-            "speed_mph": round(speed, 2),
-            "timestamp": timestamp.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z",
-            "tire_pressure_psi": tire_pressure,
+            "speed_mph": speeds[i],
+            "timestamp": timestamps[i],
+            "tire_pressure_psi": dict(zip(TIRE_KEYS, (t[i] for t in tires))),
             "vin": vin
         }
-        
-        readings.append(reading)
-    
-    return readings
+        for i in range(len(temps))
+    ]
+
+
+# Journeys are pure functions of (seed, reading count, route/timing
+# constants), so cached batches are invalidated by folding those
+# constants into the cache filename.
+CONFIG_DIGEST = hashlib.blake2b(
+    repr((DURATION_HOURS, INTERVAL_MINUTES, ROUTE_WAYPOINTS, READING_DTYPE.descr)).encode(),
+    digest_size=8,
+).hexdigest()
+
+
+def vehicle_seed(vin):
+    """Stable 32-bit RNG seed for a VIN.
+
+    Built-in hash() is randomized per interpreter run (PYTHONHASHSEED),
+    so a keyed hash is needed for the same VIN to reproduce the same
+    journey across runs.
+    """
+    return int.from_bytes(hashlib.blake2b(vin.encode(), digest_size=4).digest(), 'little')
+
+
+def _gen_one(task):
+    """Pool worker: unpack one (vehicle_idx, vin, num_readings, seed) task.
+
+    Module-level so it is picklable by multiprocessing. Journeys are
+    deterministic per seed, so completed batches are memoized on disk
+    and reruns skip the simulation entirely. The vehicle index rides
+    along so the mmap writer can compute byte offsets for unordered
+    results.
+    """
+    vehicle_idx, vin, num_readings, seed = task
+
+    cache_path = CACHE_DIR / f"{seed:08x}-{num_readings}-{CONFIG_DIGEST}.npz"
+    if cache_path.exists():
+        with np.load(cache_path) as cached:
+            return vehicle_idx, vin, cached["readings"]
+
+    arr = generate_vehicle_journey(num_readings, seed)
+    CACHE_DIR.mkdir(exist_ok=True)
+    np.savez_compressed(cache_path, readings=arr)
+    return vehicle_idx, vin, arr
+
+
+def encode_reading(reading, indent=False):
+    """Serialize one reading to JSON bytes, via orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(reading, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(reading, indent=2).encode()
+    return json.dumps(reading, separators=(",", ":")).encode()
+
+
+def reading_template(vin):
+    """Build the printf-style JSON line template for one vehicle.
+
+    Every reading shares the same key schema and VIN, so both are baked
+    into the format string once; per line only the nine numbers and the
+    timestamp get formatted. The %.2f/%.6f widths match the rounding the
+    dict path applies.
+    """
+    return (
+        '{"engine_temp_f":%.2f,"fuel_level_pct":%.2f,'
+        '"location":{"latitude":%.6f,"longitude":%.6f},'
+        '"speed_mph":%.2f,"timestamp":"%s",'
+        '"tire_pressure_psi":{"front_left":%.2f,"front_right":%.2f,'
+        '"rear_left":%.2f,"rear_right":%.2f},'
+        '"vin":"' + vin + '"}'
+    )
+
+
+def render_lines(vin, arr, timestamps):
+    """Render one columnar batch to JSON text lines via the template."""
+    tpl = reading_template(vin)
+    temps = arr["engine_temp_f"].tolist()
+    fuels = arr["fuel_level_pct"].tolist()
+    lats = arr["lat"].tolist()
+    lons = arr["lon"].tolist()
+    speeds = arr["speed_mph"].tolist()
+    fl, fr, rl, rr = (arr[key].tolist() for key in TIRE_KEYS)
+
+    return [
+        tpl % (temps[i], fuels[i], lats[i], lons[i], speeds[i],
+               timestamps[i], fl[i], fr[i], rl[i], rr[i])
+        for i in range(len(temps))
+    ]
+
+
+def write_ndjson(batches, timestamps, path):
+    """Stream per-vehicle reading batches into one NDJSON file.
+
+    A single large buffered write path avoids the per-file open/close
+    syscall and inode overhead of thousands of tiny files.
+    """
+    count = 0
+    with open(path, 'wb', buffering=1 << 20) as f:
+        for _, vin, arr in batches:
+            f.write("".join(line + "\n" for line in render_lines(vin, arr, timestamps)).encode())
+            count += len(arr)
+    return count
+
+
+def write_mmap(batches, timestamps, path, total_readings, readings_per_vehicle):
+    """Write NDJSON lines into disjoint slices of one preallocated mmap.
+
+    Every reading gets a fixed MMAP_LINE_WIDTH-byte slot, space-padded
+    before the newline, so a vehicle's byte range follows from its index
+    alone and unordered batches land without any coordination. The
+    padding keeps offsets computable for random access (line k of
+    vehicle v starts at (v * readings_per_vehicle + k) * width).
+    """
+    total_bytes = total_readings * MMAP_LINE_WIDTH
+    count = 0
+    with open(path, 'wb+') as f:
+        os.ftruncate(f.fileno(), total_bytes)
+        with mmap.mmap(f.fileno(), total_bytes) as mm:
+            for vehicle_idx, vin, arr in batches:
+                base = vehicle_idx * readings_per_vehicle * MMAP_LINE_WIDTH
+                for i, line in enumerate(render_lines(vin, arr, timestamps)):
+                    blob = line.encode()
+                    pad = MMAP_LINE_WIDTH - len(blob) - 1
+                    if pad < 0:
+                        raise ValueError(f"reading exceeds {MMAP_LINE_WIDTH}-byte line slot: {line!r}")
+                    start = base + i * MMAP_LINE_WIDTH
+                    mm[start:start + MMAP_LINE_WIDTH] = blob + b" " * pad + b"\n"
+                    count += 1
+            mm.flush()
+    return count
+
+
+def write_per_file(batches, timestamps, timestamps_fs, indent):
+    """Stream per-vehicle reading batches into one JSON file per reading.
+
+    timestamps_fs holds the filesystem-safe timestamp strings, indexed by
+    reading position within a batch, so filenames need no per-reading
+    string sanitizing.
+    """
+    file_count = 0
+    created_buckets = set()
+    for _, vin, arr in batches:
+        # Shard files across subdirectories by VIN prefix; thousands of
+        # entries in one directory make every insertion rescan/rebalance
+        # the directory index.
+        bucket = OUTPUT_DIR / vin[:2]
+        if bucket not in created_buckets:
+            bucket.mkdir(parents=True, exist_ok=True)
+            created_buckets.add(bucket)
+
+        if indent:
+            blobs = [encode_reading(r, indent) for r in readings_to_dicts(vin, arr, timestamps)]
+        else:
+            blobs = [line.encode() for line in render_lines(vin, arr, timestamps)]
+
+        for i, blob in enumerate(blobs):
+            json_filename = f"{bucket}/{vin}_{timestamps_fs[i]}.json"
+
+            # Each file gets exactly one pre-encoded blob, so skip the
+            # Python file-object stack and issue the three syscalls
+            # directly.
+            fd = os.open(json_filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                os.write(fd, blob)
+            finally:
+                os.close(fd)
+
+            file_count += 1
+    return file_count
+
+
+def parse_args():
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Generate synthetic vehicle telematics data.")
+    output_mode = parser.add_mutually_exclusive_group()
+    output_mode.add_argument(
+        "--per-file",
+        action="store_true",
+        help="write one JSON file per reading instead of a single NDJSON file",
+    )
+    output_mode.add_argument(
+        "--mmap",
+        action="store_true",
+        help="write the NDJSON file through a preallocated mmap with "
+             f"fixed {MMAP_LINE_WIDTH}-byte line slots (random-access offsets)",
+    )
+    parser.add_argument(
+        "--indent",
+        action="store_true",
+        help="pretty-print per-file JSON output (roughly doubles bytes written)",
+    )
+    return parser.parse_args()
 
 
 def main():
+    args = parse_args()
+
     print("=" * 60)
     print("Vehicle Telematics Data Generator")
     print("=" * 60)
@@ -225,15 +567,24 @@ def main():
     OUTPUT_DIR.mkdir(exist_ok=True)
     print(f"\n✓ Created output directory: {OUTPUT_DIR}")
     
-    # Generate VINs
-    print(f"\nGenerating {NUM_VEHICLES} unique VINs...")
-    vins = generate_unique_vins(NUM_VEHICLES)
-    
-    # Save VINs to file
-    with open(VIN_FILE, 'w') as f:
-        for vin in vins:
-            f.write(vin + '\n')
-    print(f"✓ Saved VINs to: {VIN_FILE}")
+    # Reuse the saved VINs when they match the configured fleet size.
+    # The notebook joins its tables against vins.txt, and a stable VIN
+    # set is what lets the per-seed journey cache hit across runs.
+    vin_path = Path(VIN_FILE)
+    vins = vin_path.read_text().split() if vin_path.exists() else []
+
+    if len(vins) == NUM_VEHICLES:
+        print(f"\n✓ Reusing {NUM_VEHICLES} VINs from: {VIN_FILE}")
+    else:
+        # Generate VINs
+        print(f"\nGenerating {NUM_VEHICLES} unique VINs...")
+        vins = generate_unique_vins(NUM_VEHICLES)
+
+        # Save VINs to file
+        with open(VIN_FILE, 'w') as f:
+            for vin in vins:
+                f.write(vin + '\n')
+        print(f"✓ Saved VINs to: {VIN_FILE}")
     
     # Calculate totals
     readings_per_vehicle = (DURATION_HOURS * 60) // INTERVAL_MINUTES
@@ -243,54 +594,116 @@ def main():
     print(f"  - {NUM_VEHICLES} vehicles")
     print(f"  - {readings_per_vehicle} readings per vehicle")
     print(f"  - {INTERVAL_MINUTES} minute intervals over {DURATION_HOURS} hour(s)")
-    print(f"  - Output: {total_readings} individual JSON files")
+    if args.per_file:
+        print(f"  - Output: {total_readings} individual JSON files")
+    else:
+        print(f"  - Output: single NDJSON file ({NDJSON_FILE})")
     
     # Start time for the data
     start_time = datetime(2025, 10, 31, 6, 0, 0)  # 6:00 AM
-    
-    # Collect all readings
-    all_readings = []
-    for idx, vin in enumerate(vins):
-        # Use VIN hash as seed for reproducibility
-        vehicle_seed = hash(vin) % (2**32)
-        readings = generate_vehicle_journey(vin, start_time, vehicle_seed)
-        all_readings.extend(readings)
-        
-        # Progress update
-        if (idx + 1) % 100 == 0 or idx == 0:
-            print(f"  Generated data for {idx + 1}/{NUM_VEHICLES} vehicles...")
-    
-    print(f"\n✓ Generated {len(all_readings):,} total readings")
-    
-    # Create individual JSON files (one entry per file)
-    print(f"\nCreating individual JSON files...")
-    file_count = 0
-    
-    for reading in all_readings:
-        vin = reading["vin"]
-        ts = reading["timestamp"].replace(":", "-").replace(".", "-")
-        json_filename = OUTPUT_DIR / f"{vin}_{ts}.json"
-        
-        with open(json_filename, 'w') as f:
-            json.dump(reading, f, indent=2)
-        
-        file_count += 1
-        if file_count % 1000 == 0:
-            print(f"  Created {file_count} files...")
-    
-    print(f"\n✓ Created {file_count} JSON files in: {OUTPUT_DIR}/")
-    
-    # Show summary
-    print("\nSample files:")
-    sample_files = sorted(OUTPUT_DIR.glob("*.json"))[:5]
-    for f in sample_files:
-        size_bytes = f.stat().st_size
-        print(f"  - {f.name} ({size_bytes} bytes)")
-    
-    print("\n" + "=" * 60)
-    print("Generation complete!")
-    print(f"Total: {file_count} JSON files (1 entry per file)")
-    print("=" * 60)
+
+    # Every vehicle samples the same instants, so format each timestamp
+    # string once here instead of once per vehicle per reading.
+    timestamps = [
+        (start_time + timedelta(minutes=i * INTERVAL_MINUTES)).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+        for i in range(readings_per_vehicle)
+    ]
+    # Filesystem-safe variants for per-file names, sanitized once here
+    timestamps_fs = [t.replace(":", "-").replace(".", "-") for t in timestamps]
+
+    # Each journey is seeded by its VIN and fully independent of the
+    # others, so fan the vehicles out across all cores.
+    tasks = [(idx, vin, readings_per_vehicle, vehicle_seed(vin)) for idx, vin in enumerate(vins)]
+
+    # Hand completed batches to background writer threads through a
+    # bounded queue, so serialization and write syscalls overlap with
+    # generation. Python file I/O releases the GIL, so a few threads hide
+    # the per-file write latency; NDJSON keeps a single thread owning the
+    # one file handle.
+    batch_queue = queue.Queue(maxsize=64)
+
+    def drain():
+        """Yield batches from the queue until a sentinel arrives."""
+        while True:
+            item = batch_queue.get()
+            if item is None:
+                return
+            yield item
+
+    counts = []
+    writer_errors = []
+
+    def run_writer(write):
+        try:
+            counts.append(write())
+        except Exception as exc:
+            writer_errors.append(exc)
+            # Keep draining so the producer never blocks on a full
+            # queue; the failure is re-raised after join below.
+            for _ in drain():
+                pass
+
+    if args.per_file:
+        print(f"\nCreating individual JSON files...")
+        num_writers = 4
+        write = lambda: write_per_file(drain(), timestamps, timestamps_fs, args.indent)
+    elif args.mmap:
+        print(f"\nWriting NDJSON file (mmap, fixed-width line slots)...")
+        num_writers = 1
+        write = lambda: write_mmap(
+            drain(), timestamps, OUTPUT_DIR / NDJSON_FILE, total_readings, readings_per_vehicle)
+    else:
+        print(f"\nWriting NDJSON file...")
+        num_writers = 1
+        write = lambda: write_ndjson(drain(), timestamps, OUTPUT_DIR / NDJSON_FILE)
+
+    writer_threads = [threading.Thread(target=run_writer, args=(write,)) for _ in range(num_writers)]
+    for t in writer_threads:
+        t.start()
+
+    try:
+        with mp.Pool() as pool:
+            for done, batch in enumerate(pool.imap_unordered(_gen_one, tasks, chunksize=8)):
+                batch_queue.put(batch)
+
+                # Progress update
+                if (done + 1) % 100 == 0 or done == 0:
+                    print(f"  Generated data for {done + 1}/{NUM_VEHICLES} vehicles...")
+    finally:
+        # Always deliver the sentinels, even if generation blows up,
+        # so the writer threads never outlive a failed producer.
+        for _ in writer_threads:
+            batch_queue.put(None)
+        for t in writer_threads:
+            t.join()
+
+    if writer_errors:
+        raise writer_errors[0]
+    file_count = sum(counts)
+
+    if args.per_file:
+        print(f"\n✓ Created {file_count} JSON files in: {OUTPUT_DIR}/")
+
+        # Show summary
+        print("\nSample files:")
+        sample_files = sorted(OUTPUT_DIR.rglob("*.json"))[:5]
+        for f in sample_files:
+            size_bytes = f.stat().st_size
+            print(f"  - {f.relative_to(OUTPUT_DIR)} ({size_bytes} bytes)")
+
+        print("\n" + "=" * 60)
+        print("Generation complete!")
+        print(f"Total: {file_count} JSON files (1 entry per file)")
+        print("=" * 60)
+    else:
+        ndjson_path = OUTPUT_DIR / NDJSON_FILE
+        size_bytes = ndjson_path.stat().st_size
+        print(f"\n✓ Wrote {file_count:,} readings to: {ndjson_path} ({size_bytes:,} bytes)")
+
+        print("\n" + "=" * 60)
+        print("Generation complete!")
+        print(f"Total: {file_count:,} readings (1 entry per line)")
+        print("=" * 60)
 
 
 if __name__ == "__main__":